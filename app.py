@@ -1,7 +1,6 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from main import simular_solar
 
 # Configuração da página
 st.set_page_config(
@@ -10,6 +9,221 @@ st.set_page_config(
     layout="wide"
 )
 
+# Máximo de pontos por série enviados ao navegador nos gráficos de linha
+PONTOS_GRAFICO = 1000
+
+# Formato de exibição das colunas numéricas da tabela completa (os valores
+# continuam numéricos, então a ordenação pelo cabeçalho segue o valor)
+FORMATOS_TABELA = {
+    'Geração (kWh)': '%.2f',
+    'Consumo (kWh)': '%.2f',
+    'Saldo créditos (kWh)': '%.2f',
+    'Tarifa (R$/kWh)': 'R$ %.3f',
+    'Preço crédito (R$/kWh)': 'R$ %.3f',
+    'Economia (R$)': 'R$ %.2f',
+    'Compra rede (R$)': 'R$ %.2f',
+    'Parcela (R$)': 'R$ %.2f',
+    'Manutenção (R$)': 'R$ %.2f',
+    'Fluxo líquido (R$)': 'R$ %.2f',
+    'Acumulado (R$)': 'R$ %.2f'
+}
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _executar_simulacao(**parametros):
+    """Executa a simulação, reaproveitando o resultado para parâmetros já simulados."""
+    import pyarrow as pa
+    from main import simular_solar
+
+    df = simular_solar(**parametros)
+    # Colunas com backend Arrow (mesmos tipos): st.dataframe não precisa
+    # converter o DataFrame para Arrow a cada rerun
+    return pa.Table.from_pandas(df, preserve_index=False).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+@st.cache_resource(show_spinner=False)
+def _preparar_simulador():
+    """Importa o simulador e carrega o kernel Numba uma vez por processo."""
+    from main import preparar_simulacao
+
+    preparar_simulacao()
+
+
+@st.cache_data(ttl=None, max_entries=4, show_spinner=False)
+def _csv_bytes(df):
+    """Serializa a simulação em CSV (UTF-8 com BOM, compatível com Excel)."""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _totais(df):
+    """Soma as colunas de economia e custos em uma única passada e lê os acumulados finais."""
+    totais = df[['Economia (R$)', 'Parcela (R$)', 'Manutenção (R$)', 'Compra rede (R$)']].sum().to_dict()
+    totais['Acumulado (R$)'] = df['Acumulado (R$)'].iat[-1]
+    totais['Acumulado com entrada (R$)'] = df['Acumulado com entrada (R$)'].iat[-1]
+    return totais
+
+
+def _indices_lttb(x, y, n_pontos):
+    """
+    Seleciona os índices de uma série pelo algoritmo LTTB (Largest-Triangle-Three-Buckets).
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto
+    que forma o maior triângulo com o ponto escolhido anteriormente e a média
+    do balde seguinte. Séries com até n_pontos pontos são mantidas inteiras.
+    """
+    n = len(x)
+    if n <= n_pontos:
+        return np.arange(n)
+
+    limites = np.linspace(1, n - 1, n_pontos - 1).astype(np.int64)
+    indices = np.empty(n_pontos, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_pontos - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        fim_proximo = limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[fim:fim_proximo].mean()
+        media_y = y[fim:fim_proximo].mean()
+
+        areas = np.abs((x[a] - media_x) * (y[inicio:fim] - y[a]) -
+                       (x[a] - x[inicio:fim]) * (media_y - y[a]))
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_acumulado(df, meses_financ, entrada):
+    """Monta o gráfico do fluxo líquido acumulado."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # Séries longas são reduzidas por LTTB; a curva com entrada é a mesma deslocada,
+    # então os mesmos índices servem para as duas
+    mes = df['Mês'].to_numpy()
+    acumulado = df['Acumulado (R$)'].to_numpy()
+    indices = _indices_lttb(mes, acumulado, PONTOS_GRAFICO)
+
+    # Linha principal (sem entrada)
+    fig.add_trace(go.Scattergl(
+        x=mes[indices],
+        y=acumulado[indices],
+        mode='lines',
+        name='Acumulado (sem entrada)',
+        line=dict(color='#2ecc71', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(46, 204, 113, 0.2)'
+    ))
+
+    # Linha com entrada (se houver)
+    if entrada > 0:
+        fig.add_trace(go.Scattergl(
+            x=mes[indices],
+            y=df['Acumulado com entrada (R$)'].to_numpy()[indices],
+            mode='lines',
+            name='Acumulado (com entrada)',
+            line=dict(color='#e74c3c', width=2, dash='dot')
+        ))
+
+    # Linha zero
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+
+    # Linha de fim do financiamento
+    if meses_financ < len(df):
+        fig.add_vline(
+            x=meses_financ,
+            line_dash="dot",
+            line_color="purple",
+            opacity=0.7,
+            annotation_text=f"Fim financiamento (mês {meses_financ})",
+            annotation_position="top"
+        )
+
+    fig.update_layout(
+        xaxis_title="Mês",
+        yaxis_title="R$",
+        hovermode='x unified',
+        height=500
+    )
+
+    return fig
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _totais_anuais(df):
+    """Soma economia e custos por ano (as linhas já estão ordenadas por mês)."""
+    colunas = ['Economia (R$)', 'Parcela (R$)', 'Manutenção (R$)', 'Compra rede (R$)']
+    anos, inicios = np.unique(df['Ano'].to_numpy(), return_index=True)
+    somas = np.add.reduceat(df[colunas].to_numpy(dtype=np.float64), inicios, axis=0)
+    df_anual = pd.DataFrame(somas, columns=colunas)
+    df_anual.insert(0, 'Ano', anos)
+    return df_anual
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _graficos_adicionais(df, meses_financ):
+    """Monta, em uma única figura, o fluxo mensal, a geração vs consumo e a economia vs custos por ano."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=("💰 Fluxo Líquido Mensal", "⚡ Geração vs Consumo", "📊 Economia vs Custos por Ano"),
+        vertical_spacing=0.08
+    )
+
+    # Fluxo líquido mensal: barras verdes se positivo, vermelhas se negativo
+    cores = ['green' if x >= 0 else 'red' for x in df['Fluxo líquido (R$)']]
+    fig.add_trace(go.Bar(x=df['Mês'], y=df['Fluxo líquido (R$)'], name='Fluxo Líquido',
+                         marker_color=cores, opacity=0.7, showlegend=False), row=1, col=1)
+    fig.add_hline(y=0, line_dash="solid", line_color="black", opacity=0.3, row=1, col=1)
+
+    # Marcar fim do financiamento
+    if meses_financ < len(df):
+        fig.add_vline(
+            x=meses_financ,
+            line_dash="dot",
+            line_color="purple",
+            opacity=0.5,
+            annotation_text="Fim financiamento",
+            row=1, col=1
+        )
+
+    # Geração vs consumo
+    fig.add_trace(go.Scattergl(x=df['Mês'], y=df['Geração (kWh)'],
+                               name='Geração', line=dict(color='orange')), row=2, col=1)
+    fig.add_trace(go.Scattergl(x=df['Mês'], y=df['Consumo (kWh)'],
+                               name='Consumo', line=dict(color='blue')), row=2, col=1)
+    if 'Saldo créditos (kWh)' in df.columns:
+        fig.add_trace(go.Scattergl(x=df['Mês'], y=df['Saldo créditos (kWh)'],
+                                   name='Saldo Créditos', line=dict(color='green', dash='dash')), row=2, col=1)
+
+    # Economia vs custos por ano
+    df_anual = _totais_anuais(df)
+    fig.add_trace(go.Bar(x=df_anual['Ano'], y=df_anual['Economia (R$)'],
+                         name='Economia', marker_color='green'), row=3, col=1)
+    fig.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Parcela (R$)'],
+                         name='Parcela', marker_color='red'), row=3, col=1)
+    fig.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Manutenção (R$)'],
+                         name='Manutenção', marker_color='orange'), row=3, col=1)
+    fig.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Compra rede (R$)'],
+                         name='Compra Rede', marker_color='purple'), row=3, col=1)
+
+    fig.update_xaxes(title_text="Mês", row=1, col=1)
+    fig.update_xaxes(title_text="Mês", row=2, col=1)
+    fig.update_xaxes(title_text="Ano", row=3, col=1)
+    fig.update_yaxes(title_text="R$", row=1, col=1)
+    fig.update_yaxes(title_text="kWh", row=2, col=1)
+    fig.update_yaxes(title_text="R$", row=3, col=1)
+    fig.update_layout(barmode='relative', hovermode='x unified', height=1200)
+
+    return fig
+
+
 # Título
 st.title("☀️ Simulador de Energia Solar")
 st.markdown("Simule a economia com energia solar considerando financiamento, manutenção e sazonalidade.")
@@ -49,7 +263,7 @@ sazonalidade = st.sidebar.checkbox("Usar sazonalidade (Florianópolis)", value=F
 if st.sidebar.button("🚀 Simular", type="primary", use_container_width=True):
     with st.spinner("Executando simulação..."):
         # Executar simulação
-        df = simular_solar(
+        df = _executar_simulacao(
             tarifa_inicial=tarifa,
             fio_b_inicial=fio_b,
             geracao_mensal_media=geracao,
@@ -80,8 +294,10 @@ if st.sidebar.button("🚀 Simular", type="primary", use_container_width=True):
         st.session_state['taxa_juros_mensal'] = taxa_juros_mensal
         st.session_state['taxa_juros_anual'] = taxa_juros_anual
 
-# Mostrar resultados se existirem
-if 'df' in st.session_state:
+# Resultados em fragmento: interações dentro dele (abas, download) reexecutam
+# apenas esta parte, sem refazer a barra lateral
+@st.fragment
+def _exibir_resultados():
     df = st.session_state['df']
     meses_financ = st.session_state['meses_financ']
     entrada = st.session_state.get('entrada', 0)
@@ -113,37 +329,38 @@ if 'df' in st.session_state:
         st.divider()
 
     # Primeira linha de métricas
+    totais = _totais(df)
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         st.metric(
             "Fluxo Líquido Acumulado",
-            f"R$ {df['Acumulado (R$)'].iloc[-1]:,.2f}",
+            f"R$ {totais['Acumulado (R$)']:,.2f}",
             delta=None
         )
 
     with col2:
         st.metric(
             "Total Economizado",
-            f"R$ {df['Economia (R$)'].sum():,.2f}"
+            f"R$ {totais['Economia (R$)']:,.2f}"
         )
 
     with col3:
         st.metric(
             "Total Pago (Financ.)",
-            f"R$ {df['Parcela (R$)'].sum():,.2f}"
+            f"R$ {totais['Parcela (R$)']:,.2f}"
         )
 
     with col4:
         st.metric(
             "Total Manutenção",
-            f"R$ {df['Manutenção (R$)'].sum():,.2f}"
+            f"R$ {totais['Manutenção (R$)']:,.2f}"
         )
 
     with col5:
         st.metric(
             "Total Compra Rede",
-            f"R$ {df['Compra rede (R$)'].sum():,.2f}"
+            f"R$ {totais['Compra rede (R$)']:,.2f}"
         )
 
     # Análise da entrada (se houver)
@@ -159,9 +376,9 @@ if 'df' in st.session_state:
 
         with col_b:
             # Encontrar quando recupera a entrada
-            df_positivo_entrada = df[df['Acumulado com entrada (R$)'] > 0]
-            if not df_positivo_entrada.empty:
-                mes_recupera = df_positivo_entrada.iloc[0]['Mês']
+            positivo = df['Acumulado com entrada (R$)'].to_numpy() > 0
+            if positivo.any():
+                mes_recupera = int(df['Mês'].iat[np.argmax(positivo)])
                 anos_recupera = mes_recupera // 12
                 meses_resto = mes_recupera % 12
                 st.metric(
@@ -179,62 +396,18 @@ if 'df' in st.session_state:
 
         with col_c:
             # Comparar com e sem entrada
-            acum_final_com_entrada = df['Acumulado com entrada (R$)'].iloc[-1]
+            acum_final_com_entrada = totais['Acumulado com entrada (R$)']
             st.metric(
                 "Saldo Final (com entrada)",
                 f"R$ {acum_final_com_entrada:,.2f}",
-                delta=f"R$ {acum_final_com_entrada - df['Acumulado (R$)'].iloc[-1]:,.2f}",
+                delta=f"R$ {acum_final_com_entrada - totais['Acumulado (R$)']:,.2f}",
                 help="Fluxo acumulado descontando a entrada"
             )
 
     # Gráfico principal
     st.header("📈 Fluxo Líquido Acumulado")
 
-    fig = go.Figure()
-
-    # Linha principal (sem entrada)
-    fig.add_trace(go.Scatter(
-        x=df['Mês'],
-        y=df['Acumulado (R$)'],
-        mode='lines',
-        name='Acumulado (sem entrada)',
-        line=dict(color='#2ecc71', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(46, 204, 113, 0.2)'
-    ))
-
-    # Linha com entrada (se houver)
-    if entrada > 0:
-        fig.add_trace(go.Scatter(
-            x=df['Mês'],
-            y=df['Acumulado com entrada (R$)'],
-            mode='lines',
-            name='Acumulado (com entrada)',
-            line=dict(color='#e74c3c', width=2, dash='dot')
-        ))
-
-    # Linha zero
-    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-
-    # Linha de fim do financiamento
-    if meses_financ < len(df):
-        fig.add_vline(
-            x=meses_financ,
-            line_dash="dot",
-            line_color="purple",
-            opacity=0.7,
-            annotation_text=f"Fim financiamento (mês {meses_financ})",
-            annotation_position="top"
-        )
-
-    fig.update_layout(
-        xaxis_title="Mês",
-        yaxis_title="R$",
-        hovermode='x unified',
-        height=500
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_grafico_acumulado(df, meses_financ, entrada), use_container_width=True)
 
     # Tabela de dados
     st.header("📋 Dados Detalhados")
@@ -244,104 +417,38 @@ if 'df' in st.session_state:
 
     with tab1:
         st.dataframe(
-            df.style.format({
-                'Geração (kWh)': '{:.2f}',
-                'Consumo (kWh)': '{:.2f}',
-                'Saldo créditos (kWh)': '{:.2f}',
-                'Tarifa (R$/kWh)': 'R$ {:.3f}',
-                'Preço crédito (R$/kWh)': 'R$ {:.3f}',
-                'Economia (R$)': 'R$ {:.2f}',
-                'Compra rede (R$)': 'R$ {:.2f}',
-                'Parcela (R$)': 'R$ {:.2f}',
-                'Manutenção (R$)': 'R$ {:.2f}',
-                'Fluxo líquido (R$)': 'R$ {:.2f}',
-                'Acumulado (R$)': 'R$ {:.2f}'
-            }),
+            df,
+            column_config={
+                coluna: st.column_config.NumberColumn(format=formato)
+                for coluna, formato in FORMATOS_TABELA.items()
+            },
             use_container_width=True,
             height=400
         )
 
     with tab2:
-        # Gráfico de fluxo líquido mensal
-        st.subheader("💰 Fluxo Líquido Mensal")
-        fig_fluxo = go.Figure()
-
-        # Criar cores para barras (verde se positivo, vermelho se negativo)
-        cores = ['green' if x >= 0 else 'red' for x in df['Fluxo líquido (R$)']]
-
-        fig_fluxo.add_trace(go.Bar(
-            x=df['Mês'],
-            y=df['Fluxo líquido (R$)'],
-            name='Fluxo Líquido',
-            marker_color=cores,
-            opacity=0.7
-        ))
-
-        fig_fluxo.add_hline(y=0, line_dash="solid", line_color="black", opacity=0.3)
-
-        # Marcar fim do financiamento
-        if meses_financ < len(df):
-            fig_fluxo.add_vline(
-                x=meses_financ,
-                line_dash="dot",
-                line_color="purple",
-                opacity=0.5,
-                annotation_text="Fim financiamento"
-            )
-
-        fig_fluxo.update_layout(
-            xaxis_title="Mês",
-            yaxis_title="R$",
-            hovermode='x unified',
-            showlegend=False
-        )
-        st.plotly_chart(fig_fluxo, use_container_width=True)
-
-        # Gráfico de geração vs consumo
-        st.subheader("⚡ Geração vs Consumo")
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(x=df['Mês'], y=df['Geração (kWh)'],
-                                  name='Geração', line=dict(color='orange')))
-        fig2.add_trace(go.Scatter(x=df['Mês'], y=df['Consumo (kWh)'],
-                                  name='Consumo', line=dict(color='blue')))
-        if 'Saldo créditos (kWh)' in df.columns:
-            fig2.add_trace(go.Scatter(x=df['Mês'], y=df['Saldo créditos (kWh)'],
-                                     name='Saldo Créditos', line=dict(color='green', dash='dash')))
-        fig2.update_layout(xaxis_title="Mês", yaxis_title="kWh", hovermode='x unified')
-        st.plotly_chart(fig2, use_container_width=True)
-
-        # Gráfico de economia anual
-        st.subheader("📊 Economia vs Custos por Ano")
-        df_anual = df.groupby('Ano').agg({
-            'Economia (R$)': 'sum',
-            'Parcela (R$)': 'sum',
-            'Manutenção (R$)': 'sum',
-            'Compra rede (R$)': 'sum'
-        }).reset_index()
-
-        fig3 = go.Figure()
-        fig3.add_trace(go.Bar(x=df_anual['Ano'], y=df_anual['Economia (R$)'],
-                             name='Economia', marker_color='green'))
-        fig3.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Parcela (R$)'],
-                             name='Parcela', marker_color='red'))
-        fig3.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Manutenção (R$)'],
-                             name='Manutenção', marker_color='orange'))
-        fig3.add_trace(go.Bar(x=df_anual['Ano'], y=-df_anual['Compra rede (R$)'],
-                             name='Compra Rede', marker_color='purple'))
-        fig3.update_layout(xaxis_title="Ano", yaxis_title="R$", barmode='relative', hovermode='x unified')
-        st.plotly_chart(fig3, use_container_width=True)
+        # Fluxo mensal, geração vs consumo e economia anual em uma única figura
+        st.plotly_chart(_graficos_adicionais(df, meses_financ), use_container_width=True)
 
     with tab3:
         st.markdown("### Exportar Dados")
         st.download_button(
             label="📥 Download CSV",
-            data=df.to_csv(index=False).encode('utf-8-sig'),
+            # Cacheado por DataFrame: reruns reaproveitam os mesmos bytes
+            data=_csv_bytes(df),
             file_name="simulacao_solar.csv",
             mime="text/csv",
             use_container_width=True
         )
         st.caption("💡 Baixe os dados completos da simulação em formato CSV (compatível com Excel, Google Sheets, etc.)")
 
+
+# Mostrar resultados se existirem
+if 'df' in st.session_state:
+    _exibir_resultados()
 else:
     # Mensagem inicial
     st.info("👈 Configure os parâmetros na barra lateral e clique em 'Simular' para começar!")
+
+# Depois da primeira renderização: carrega o kernel para o primeiro "Simular" não esperar
+_preparar_simulador()
@@ -1,7 +1,54 @@
-import pandas as pd
 import argparse
+import functools
 from collections import deque
 
+import numpy as np
+
+# pandas, Polars e Numba são importados sob demanda: `main.py --help` não paga
+# o custo de importá-los
+
+# Fatores de sazonalidade para Florianópolis (baseado em insolação típica)
+# Índice 0 = Janeiro, 11 = Dezembro
+# Valores relativos à média anual (1.0 = média)
+SAZONALIDADE_FLORIANOPOLIS = np.array([
+    1.25,  # Janeiro - verão, alta insolação
+    1.20,  # Fevereiro - verão
+    1.10,  # Março - outono começa
+    0.90,  # Abril - outono
+    0.75,  # Maio - outono/inverno
+    0.70,  # Junho - inverno, menor insolação
+    0.75,  # Julho - inverno
+    0.85,  # Agosto - inverno/primavera
+    0.95,  # Setembro - primavera
+    1.05,  # Outubro - primavera
+    1.15,  # Novembro - primavera/verão
+    1.25,  # Dezembro - verão
+], dtype=np.float64)
+SAZONALIDADE_UNIFORME = np.ones(12, dtype=np.float64)
+
+# Percentual de Fio B pago por ano a partir de 2026 (Lei 14.300/2022)
+ANO_BASE_FIO_B = 2026
+PAGAMENTO_FIO_B = np.array([0.60, 0.75, 0.90, 1.00, 1.00, 1.00], dtype=np.float64)
+# Mesma tabela com 1.00 (100%) antes e depois, para indexar por ano sem condicionais
+_PAGAMENTO_FIO_B_ESTENDIDO = np.concatenate(([1.00], PAGAMENTO_FIO_B, [1.00]))
+
+# Tabelas compartilhadas entre chamadas: somente leitura
+SAZONALIDADE_FLORIANOPOLIS.setflags(write=False)
+SAZONALIDADE_UNIFORME.setflags(write=False)
+PAGAMENTO_FIO_B.setflags(write=False)
+_PAGAMENTO_FIO_B_ESTENDIDO.setflags(write=False)
+
+# Casas decimais de cada coluna no resultado de simular_solar
+_CASAS_DECIMAIS = {
+    "Geração (kWh)": 2,
+    "Consumo (kWh)": 2,
+    "Saldo créditos (kWh)": 2,
+    "Tarifa (R$/kWh)": 3,
+    "Preço crédito (R$/kWh)": 3,
+    "Economia (R$)": 2,
+    "Compra rede (R$)": 2,
+}
+
 def calcular_parcela_price(valor_financiado, taxa_juros_mensal, num_parcelas):
     """
     Calcula o valor da parcela usando Tabela Price.
@@ -21,7 +68,124 @@ def calcular_parcela_price(valor_financiado, taxa_juros_mensal, num_parcelas):
            ((1 + taxa_juros_mensal)**num_parcelas - 1)
 
 
-def simular_solar(
+def _balanco_energia(energia_injetada, consumo_rede, auto_consumo, tarifa, preco_credito,
+                     saldo, economia, compra_rede):
+    """
+    Calcula mês a mês o saldo de créditos e o resultado financeiro da energia.
+
+    O saldo de créditos é a única dependência sequencial; economia e compra
+    da rede são calculadas no mesmo laço, direto nos arrays de saída, sem
+    arrays temporários intermediários.
+
+    Args:
+        energia_injetada: Energia injetada na rede em cada mês (kWh)
+        consumo_rede: Consumo mensal atendido pela rede (kWh)
+        auto_consumo: Consumo mensal atendido por autoconsumo instantâneo (kWh)
+        tarifa: Tarifa de cada mês (R$/kWh)
+        preco_credito: Preço do crédito injetado em cada mês (R$/kWh)
+        saldo: Array de saída com o saldo de créditos ao fim de cada mês (kWh)
+        economia: Array de saída com a economia de cada mês (R$)
+        compra_rede: Array de saída com o custo da energia comprada da rede (R$)
+    """
+    saldo_creditos = 0.0
+    for i in range(energia_injetada.shape[0]):
+        # Adiciona energia injetada e usa os créditos para compensar o consumo da rede
+        saldo_creditos += energia_injetada[i]
+        energia_compensada = min(consumo_rede, saldo_creditos)
+        saldo_creditos -= energia_compensada
+
+        # Energia que ainda precisa comprar da rede (após usar créditos)
+        energia_comprada_rede = consumo_rede - energia_compensada
+
+        saldo[i] = saldo_creditos
+        # Autoconsumo pela tarifa cheia, energia compensada pelo preço do crédito
+        economia[i] = (auto_consumo * tarifa[i]) + (energia_compensada * preco_credito[i])
+        compra_rede[i] = energia_comprada_rede * tarifa[i]
+
+
+def _balanco_energia_vetorizado(energia_injetada, consumo_rede, auto_consumo, tarifa, preco_credito,
+                                saldo, economia, compra_rede):
+    """
+    Mesmo cálculo de _balanco_energia, sem laço Python.
+
+    O saldo segue a recorrência s_t = max(0, s_{t-1} + injetada_t - consumo_rede),
+    cuja forma fechada é s_t = c_t - min(0, min_{k<=t} c_k), com c = cumsum(injetada - consumo_rede).
+    """
+    acumulado = np.cumsum(energia_injetada - consumo_rede)
+    saldo[:] = acumulado - np.minimum(np.minimum.accumulate(acumulado), 0)
+
+    saldo_anterior = np.concatenate(([0.0], saldo[:-1]))
+    energia_compensada = np.minimum(consumo_rede, saldo_anterior + energia_injetada)
+    energia_comprada_rede = consumo_rede - energia_compensada
+
+    economia[:] = (auto_consumo * tarifa) + (energia_compensada * preco_credito)
+    compra_rede[:] = energia_comprada_rede * tarifa
+
+
+@functools.cache
+def _kernel_balanco():
+    """
+    Retorna a implementação do balanço de energia, escolhida na primeira chamada.
+
+    Com Numba o laço de _balanco_energia é compilado (assinatura explícita, lida
+    do cache em disco quando disponível); sem ele, usa a forma fechada em NumPy.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # Numba é opcional
+        return _balanco_energia_vetorizado
+    assinatura = "void(float64[:], float64, float64, float64[:], float64[:], float64[:], float64[:], float64[:])"
+    return njit(assinatura, cache=True)(_balanco_energia)
+
+
+def preparar_simulacao():
+    """
+    Carrega antecipadamente o kernel do balanço de energia (Numba, se instalado).
+
+    Fica fora do caminho de `--help`: a CLI chama depois de ler os argumentos e o
+    app depois da primeira renderização, para a primeira simulação não pagar a
+    importação do Numba e a carga do kernel.
+    """
+    _kernel_balanco()
+
+
+@functools.cache
+def _importar_polars():
+    """Importa o Polars sob demanda; retorna None se não estiver instalado."""
+    try:
+        import polars as pl
+    except ImportError:  # Polars é opcional: sem ele a tabela e o CSV da CLI usam pandas
+        return None
+    return pl
+
+
+@functools.lru_cache(maxsize=128)
+def _fatores_anuais(reajuste_anual, degradacao_anual, anos_simulacao):
+    """
+    Calcula os fatores de reajuste e de degradação de cada mês da simulação.
+
+    Os fatores são calculados uma vez por ano e repetidos para os 12 meses. Como
+    dependem só destes três parâmetros, ficam memorizados: varreduras que alteram
+    outros parâmetros (consumo, financiamento...) reaproveitam os mesmos arrays.
+
+    Args:
+        reajuste_anual: Taxa de reajuste anual da tarifa (0-1)
+        degradacao_anual: Taxa de degradação anual da eficiência (0-1)
+        anos_simulacao: Duração total da simulação em anos
+
+    Returns:
+        Tupla (fator_reajuste, fator_degradacao) de arrays somente leitura
+    """
+    anos_idx = np.arange(anos_simulacao)
+    fator_reajuste = np.repeat((1 + reajuste_anual) ** anos_idx, 12)
+    fator_degradacao = np.repeat((1 - degradacao_anual) ** anos_idx, 12)
+    # Compartilhados entre chamadas: somente leitura
+    fator_reajuste.setflags(write=False)
+    fator_degradacao.setflags(write=False)
+    return fator_reajuste, fator_degradacao
+
+
+def calcular_simulacao(
     tarifa_inicial=0.973,
     fio_b_inicial=0.69568,
     geracao_mensal_media=1346.64,
@@ -41,6 +205,8 @@ def simular_solar(
     """
     Simula economia com energia solar considerando financiamento, manutenção, degradação e sazonalidade.
 
+    Saída primitiva da simulação: as colunas como arrays NumPy, sem montar DataFrame.
+
     Args:
         tarifa_inicial: Tarifa total inicial (R$/kWh)
         fio_b_inicial: Tarifa Fio B inicial (R$/kWh)
@@ -57,194 +223,257 @@ def simular_solar(
         degradacao_anual: Taxa de degradação anual da eficiência (0-1, padrão 0.5%)
         ano_inicial: Ano inicial da simulação
         usar_sazonalidade: Se True, aplica variação sazonal típica de Florianópolis
+
+    Returns:
+        Dicionário {nome da coluna: array}, com uma posição por mês simulado
     """
     # Calcular valor financiado e parcela
     valor_financiado = valor_sistema - entrada
     taxa_juros_mensal = (1 + taxa_juros_anual) ** (1/12) - 1
     valor_parcela = calcular_parcela_price(valor_financiado, taxa_juros_mensal, meses_financiamento) if valor_financiado > 0 else 0
-    # Percentual de Fio B pago por ano (Lei 14.300/2022)
-    pagamento_fioB = {
-        2026: 0.60, 2027: 0.75, 2028: 0.90,
-        2029: 1.00, 2030: 1.00, 2031: 1.00
-    }
 
-    # Fatores de sazonalidade para Florianópolis (baseado em insolação típica)
-    # Janeiro = mês 1, Dezembro = mês 12
-    # Valores relativos à média anual (1.0 = média)
-    sazonalidade_mensal = {
-        1: 1.25,   # Janeiro - verão, alta insolação
-        2: 1.20,   # Fevereiro - verão
-        3: 1.10,   # Março - outono começa
-        4: 0.90,   # Abril - outono
-        5: 0.75,   # Maio - outono/inverno
-        6: 0.70,   # Junho - inverno, menor insolação
-        7: 0.75,   # Julho - inverno
-        8: 0.85,   # Agosto - inverno/primavera
-        9: 0.95,   # Setembro - primavera
-        10: 1.05,  # Outubro - primavera
-        11: 1.15,  # Novembro - primavera/verão
-        12: 1.25   # Dezembro - verão
-    }
+    # Fatores de sazonalidade (sem sazonalidade = fatores 1.0)
+    sazonalidade = SAZONALIDADE_FLORIANOPOLIS if usar_sazonalidade else SAZONALIDADE_UNIFORME
 
     custo_manutencao_mensal = custo_manutencao_anual / 12
-    saldo_creditos = 0  # Saldo de créditos de energia acumulados (kWh)
-
-    dados = []
-    tarifa = tarifa_inicial
-    fio_b = fio_b_inicial
-
-    for mes in range(1, anos_simulacao * 12 + 1):
-        ano = ano_inicial + (mes - 1) // 12
-        anos_passados = (mes - 1) // 12
-        mes_do_ano = ((mes - 1) % 12) + 1  # 1-12
-
-        # Reajuste anual (aplicado no início de cada ano)
-        if mes > 1 and (mes - 1) % 12 == 0:
-            tarifa *= (1 + reajuste_anual)
-            fio_b *= (1 + reajuste_anual)
-
-        # Geração considerando degradação e sazonalidade
-        geracao_base = geracao_mensal_media * ((1 - degradacao_anual) ** anos_passados)
 
-        if usar_sazonalidade:
-            fator_sazonal = sazonalidade_mensal[mes_do_ano]
-            geracao_mensal = geracao_base * fator_sazonal
-        else:
-            geracao_mensal = geracao_base
-
-        # Percentual do Fio B (100% após 2029)
-        p_fio_b = pagamento_fioB.get(ano, 1.00)
-
-        # Preço do crédito injetado
-        preco_credito = tarifa - (fio_b * p_fio_b)
-
-        # Cálculo da economia considerando a geração real e créditos acumulados
-        auto_consumo = consumo_mensal * perc_autoconsumo
-        consumo_rede = consumo_mensal - auto_consumo
-
-        # Energia disponível para crédito (injetada na rede)
-        energia_injetada = max(0, geracao_mensal - auto_consumo)
+    n_meses = anos_simulacao * 12
+    # Mês e ano cabem em int32; valores monetários e de energia seguem em float64,
+    # pois os acumulados precisam de precisão de centavos em dezenas de anos
+    mes = np.arange(1, n_meses + 1, dtype=np.int32)
+    anos_passados = (mes - 1) // 12
+    ano = ano_inicial + anos_passados
+
+    # Fatores anuais repetidos para os 12 meses (memorizados entre chamadas)
+    fator_reajuste, fator_degradacao = _fatores_anuais(reajuste_anual, degradacao_anual, anos_simulacao)
+
+    # Reajuste anual da tarifa e do Fio B
+    tarifa = tarifa_inicial * fator_reajuste
+    fio_b = fio_b_inicial * fator_reajuste
+
+    # Geração considerando degradação e sazonalidade
+    geracao = geracao_mensal_media * fator_degradacao * sazonalidade[(mes - 1) % 12]
+
+    # Percentual do Fio B (100% após 2029)
+    # Anos fora da tabela caem nas bordas de 1.00 da tabela estendida: uma única indexação
+    idx_fio_b = np.clip(ano - (ANO_BASE_FIO_B - 1), 0, len(_PAGAMENTO_FIO_B_ESTENDIDO) - 1)
+    p_fio_b = _PAGAMENTO_FIO_B_ESTENDIDO[idx_fio_b]
+
+    # Preço do crédito injetado
+    preco_credito = tarifa - (fio_b * p_fio_b)
+
+    # Autoconsumo e consumo da rede não variam ao longo da simulação
+    auto_consumo = consumo_mensal * perc_autoconsumo
+    consumo_rede = consumo_mensal - auto_consumo
+
+    # Energia disponível para crédito (injetada na rede)
+    energia_injetada = np.maximum(0, geracao - auto_consumo)
+
+    # Saldo de créditos (único estado que atravessa os meses), economia e compra da rede:
+    # - Autoconsumo valorizado pela tarifa cheia
+    # - Energia compensada valorizada pelo preço do crédito
+    # - Energia que ainda precisa comprar da rede paga pela tarifa
+    saldo_creditos, economia, compra_rede = (np.empty(n_meses) for _ in range(3))
+    _kernel_balanco()(energia_injetada, consumo_rede, auto_consumo, tarifa, preco_credito,
+                      saldo_creditos, economia, compra_rede)
+
+    # Parcela do financiamento (0 após término): os meses estão em ordem, basta uma fatia
+    parcela = np.full(n_meses, valor_parcela, dtype=np.float64)
+    parcela[max(meses_financiamento, 0):] = 0.0
+
+    # Fluxo líquido = economia - parcela - manutenção - energia comprada da rede
+    # Arredondado antes de acumular, para o acumulado bater com a soma do fluxo exibido
+    # (calculados in-place, sem arrays temporários a cada operação)
+    fluxo_liquido = economia - parcela
+    fluxo_liquido -= custo_manutencao_mensal
+    fluxo_liquido -= compra_rede
+    np.round(fluxo_liquido, 2, out=fluxo_liquido)
+    acumulado = np.empty(n_meses)
+    np.cumsum(fluxo_liquido, out=acumulado)
+
+    # Rótulo "MM/AAAA" montado com operações de string vetorizadas
+    mes_do_ano = (mes - 1) % 12 + 1
+    mes_ano = np.char.add(np.char.zfill(mes_do_ano.astype(str), 2), np.char.add("/", ano.astype(str)))
+
+    resultado = {
+        "Mês": mes,
+        "Ano": ano,
+        "Mês/Ano": mes_ano,
+        "Geração (kWh)": geracao,
+        "Consumo (kWh)": np.full(n_meses, consumo_mensal),
+        "Saldo créditos (kWh)": saldo_creditos,
+        "Tarifa (R$/kWh)": tarifa,
+        "Preço crédito (R$/kWh)": preco_credito,
+        "Economia (R$)": economia,
+        "Compra rede (R$)": compra_rede,
+        "Parcela (R$)": parcela,
+        # Valor constante: arredondado uma vez, como escalar
+        "Manutenção (R$)": np.full(n_meses, round(custo_manutencao_mensal, 2)),
+        "Fluxo líquido (R$)": fluxo_liquido,
+        "Acumulado (R$)": acumulado,
+        # Acumulado considerando a entrada paga no mês 1
+        "Acumulado com entrada (R$)": acumulado - entrada
+    }
 
-        # Adiciona energia injetada ao saldo de créditos
-        saldo_creditos += energia_injetada
+    # Demais arredondamentos: uma vez, sobre as colunas inteiras
+    for coluna, casas in _CASAS_DECIMAIS.items():
+        resultado[coluna] = np.round(resultado[coluna], casas)
 
-        # Usa créditos acumulados para compensar o consumo da rede
-        energia_compensada = min(consumo_rede, saldo_creditos)
-        saldo_creditos -= energia_compensada
+    return resultado
 
-        # Energia que ainda precisa comprar da rede (após usar créditos)
-        energia_comprada_rede = consumo_rede - energia_compensada
 
-        # Economia total:
-        # - Autoconsumo valorizado pela tarifa cheia
-        # - Energia compensada valorizada pelo preço do crédito
-        economia = (auto_consumo * tarifa) + (energia_compensada * preco_credito)
+def para_dataframe(resultado):
+    """Monta o DataFrame a partir das colunas devolvidas por calcular_simulacao."""
+    import pandas as pd
 
-        # Custo da energia que ainda precisa comprar (se houver)
-        custo_energia_rede = energia_comprada_rede * tarifa
+    return pd.DataFrame(resultado)
 
-        # Parcela do financiamento (0 após término)
-        parcela = valor_parcela if mes <= meses_financiamento else 0
 
-        # Fluxo líquido = economia - parcela - manutenção - energia comprada da rede
-        fluxo_liquido = economia - parcela - custo_manutencao_mensal - custo_energia_rede
+def simular_solar(
+    tarifa_inicial=0.973,
+    fio_b_inicial=0.69568,
+    geracao_mensal_media=1346.64,
+    consumo_mensal=1237.17,
+    perc_autoconsumo=0.20,
+    valor_sistema=28000,
+    entrada=0,
+    taxa_juros_anual=0.10,
+    meses_financiamento=72,
+    anos_simulacao=10,
+    reajuste_anual=0.10,
+    custo_manutencao_anual=750,
+    degradacao_anual=0.005,
+    ano_inicial=2026,
+    usar_sazonalidade=True
+):
+    """
+    Simula economia com energia solar e devolve o resultado como DataFrame.
 
-        dados.append({
-            "Mês": mes,
-            "Ano": ano,
-            "Mês/Ano": f"{mes_do_ano:02d}/{ano}",
-            "Geração (kWh)": round(geracao_mensal, 2),
-            "Consumo (kWh)": round(consumo_mensal, 2),
-            "Saldo créditos (kWh)": round(saldo_creditos, 2),
-            "Tarifa (R$/kWh)": round(tarifa, 3),
-            "Preço crédito (R$/kWh)": round(preco_credito, 3),
-            "Economia (R$)": round(economia, 2),
-            "Compra rede (R$)": round(custo_energia_rede, 2),
-            "Parcela (R$)": parcela,
-            "Manutenção (R$)": round(custo_manutencao_mensal, 2),
-            "Fluxo líquido (R$)": round(fluxo_liquido, 2)
-        })
+    Os parâmetros são os mesmos de calcular_simulacao (ver a documentação de lá).
 
-    df = pd.DataFrame(dados)
-    df["Acumulado (R$)"] = df["Fluxo líquido (R$)"].cumsum()
+    Returns:
+        DataFrame com uma linha por mês simulado
+    """
+    return para_dataframe(calcular_simulacao(
+        tarifa_inicial=tarifa_inicial,
+        fio_b_inicial=fio_b_inicial,
+        geracao_mensal_media=geracao_mensal_media,
+        consumo_mensal=consumo_mensal,
+        perc_autoconsumo=perc_autoconsumo,
+        valor_sistema=valor_sistema,
+        entrada=entrada,
+        taxa_juros_anual=taxa_juros_anual,
+        meses_financiamento=meses_financiamento,
+        anos_simulacao=anos_simulacao,
+        reajuste_anual=reajuste_anual,
+        custo_manutencao_anual=custo_manutencao_anual,
+        degradacao_anual=degradacao_anual,
+        ano_inicial=ano_inicial,
+        usar_sazonalidade=usar_sazonalidade
+    ))
+
+
+def _agregados_resumo(dados, meses_financiamento):
+    """Calcula todos os números do resumo de uma vez, com fatias NumPy.
 
-    # Calcular acumulado considerando a entrada paga no mês 1
-    df["Acumulado com entrada (R$)"] = df["Acumulado (R$)"] - entrada
+    Args:
+        dados: DataFrame ou dicionário de colunas com os resultados
+        meses_financiamento: Número de meses do financiamento
 
-    return df
+    Returns:
+        Dicionário com os totais, médias e indicadores de payback
+    """
+    # Os meses estão em ordem, então os períodos são fatias
+    mes = np.asarray(dados["Mês"])
+    geracao = np.asarray(dados["Geração (kWh)"])
+    fluxo = np.asarray(dados["Fluxo líquido (R$)"])
+    acumulado = np.asarray(dados["Acumulado (R$)"])
+    n_meses = mes.shape[0]  # calculado uma vez; os demais comprimentos derivam dele
+    k = min(max(meses_financiamento, 0), n_meses)
+    fluxo_pos = fluxo[k:]
+    idx_min = int(acumulado.argmin())
+    idx_negativos = np.flatnonzero(acumulado < 0)
+
+    return {
+        "n_meses": n_meses,
+        "total_economia": np.asarray(dados["Economia (R$)"]).sum(),
+        "total_pago": np.asarray(dados["Parcela (R$)"]).sum(),
+        "total_manutencao": np.asarray(dados["Manutenção (R$)"]).sum(),
+        "total_compra_rede": np.asarray(dados["Compra rede (R$)"]).sum(),
+        "media_mensal": fluxo.mean(),
+        "fluxo_durante_financ": fluxo[:k].sum(),
+        "meses_pos_financ": n_meses - k,
+        "fluxo_pos_financ": fluxo_pos.sum(),
+        "media_pos_financ": fluxo_pos.mean() if k < n_meses else None,
+        "fluxo_final": acumulado[-1],
+        "geracao_inicial": geracao[0],
+        "geracao_final": geracao[-1],
+        "acum_fim_financ": acumulado[k - 1] if k > 0 else 0,
+        "acum_min": acumulado[idx_min],
+        "idx_min": idx_min,
+        "ultimo_mes_negativo": int(mes[idx_negativos[-1]]) if idx_negativos.size else None,
+    }
 
 
-def exibir_resultados(df, meses_financiamento, exportar_csv=True, nome_arquivo="simulacao_solar.csv"):
+def exibir_resultados(dados, meses_financiamento, exportar_csv=True, nome_arquivo="simulacao_solar.csv",
+                      exibir_tabela=True):
     """Exibe resultados da simulação de forma formatada.
 
     Args:
-        df: DataFrame com os resultados da simulação
+        dados: DataFrame ou dicionário de colunas (calcular_simulacao) com os resultados
         meses_financiamento: Número de meses do financiamento
         exportar_csv: Se True, exporta os resultados para CSV
         nome_arquivo: Nome do arquivo CSV a ser gerado
+        exibir_tabela: Se True, imprime a tabela mês a mês antes do resumo
     """
-    pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
-
-    print("\n=== SIMULAÇÃO MENSAL ===")
-    print(df.to_string(index=False))
-
-    # Resumo geral
-    total_economia = df["Economia (R$)"].sum()
-    total_pago = df["Parcela (R$)"].sum()
-    total_manutencao = df["Manutenção (R$)"].sum()
-    total_compra_rede = df["Compra rede (R$)"].sum()
-    fluxo_final = df["Acumulado (R$)"].iloc[-1]
-    media_mensal = df["Fluxo líquido (R$)"].mean()
-
-    geracao_inicial = df["Geração (kWh)"].iloc[0]
-    geracao_final = df["Geração (kWh)"].iloc[-1]
+    if exibir_tabela:
+        import pandas as pd
+
+        print("\n=== SIMULAÇÃO MENSAL ===")
+        tabela = para_dataframe(dados) if isinstance(dados, dict) else dados
+        pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
+        print(tabela.to_string(index=False))
+
+    r = _agregados_resumo(dados, meses_financiamento)
+    n_meses = r["n_meses"]
+    fluxo_final = r["fluxo_final"]
+    geracao_inicial = r["geracao_inicial"]
+    geracao_final = r["geracao_final"]
     degradacao_total = ((geracao_inicial - geracao_final) / geracao_inicial) * 100
 
     print("\n=== RESUMO FINAL ===")
-    print(f"Período total: {len(df)} meses ({len(df) // 12} anos)")
-    print(f"Total economizado: R$ {total_economia:,.2f}")
-    print(f"Total pago no financiamento: R$ {total_pago:,.2f}")
-    print(f"Total gasto com manutenção: R$ {total_manutencao:,.2f}")
-    print(f"Total gasto com compra de energia: R$ {total_compra_rede:,.2f}")
+    print(f"Período total: {n_meses} meses ({n_meses // 12} anos)")
+    print(f"Total economizado: R$ {r['total_economia']:,.2f}")
+    print(f"Total pago no financiamento: R$ {r['total_pago']:,.2f}")
+    print(f"Total gasto com manutenção: R$ {r['total_manutencao']:,.2f}")
+    print(f"Total gasto com compra de energia: R$ {r['total_compra_rede']:,.2f}")
     print(f"Fluxo líquido acumulado: R$ {fluxo_final:,.2f}")
-    print(f"Média mensal de fluxo líquido: R$ {media_mensal:,.2f}")
+    print(f"Média mensal de fluxo líquido: R$ {r['media_mensal']:,.2f}")
     print(f"\nDegradação das placas: {degradacao_total:.2f}% ({geracao_inicial:.2f} → {geracao_final:.2f} kWh/mês)")
 
     # Análise do período de financiamento
-    df_financiamento = df[df["Mês"] <= meses_financiamento]
-    fluxo_durante_financ = df_financiamento["Fluxo líquido (R$)"].sum()
-    acum_fim_financ = df_financiamento["Acumulado (R$)"].iloc[-1] if not df_financiamento.empty else 0
-
     print(f"\n=== ANÁLISE POR PERÍODO ===")
     print(f"Durante financiamento ({meses_financiamento} meses):")
-    print(f"  - Fluxo líquido total: R$ {fluxo_durante_financ:,.2f}")
-    print(f"  - Acumulado ao final: R$ {acum_fim_financ:,.2f}")
+    print(f"  - Fluxo líquido total: R$ {r['fluxo_durante_financ']:,.2f}")
+    print(f"  - Acumulado ao final: R$ {r['acum_fim_financ']:,.2f}")
 
     # Análise do período pós-financiamento
-    if len(df) > meses_financiamento:
-        df_pos_financ = df[df["Mês"] > meses_financiamento]
-        fluxo_pos_financ = df_pos_financ["Fluxo líquido (R$)"].sum()
-        media_pos_financ = df_pos_financ["Fluxo líquido (R$)"].mean()
-
-        print(f"\nApós financiamento ({len(df_pos_financ)} meses):")
-        print(f"  - Fluxo líquido total: R$ {fluxo_pos_financ:,.2f}")
-        print(f"  - Média mensal: R$ {media_pos_financ:,.2f}")
+    if n_meses > meses_financiamento:
+        print(f"\nApós financiamento ({r['meses_pos_financ']} meses):")
+        print(f"  - Fluxo líquido total: R$ {r['fluxo_pos_financ']:,.2f}")
+        print(f"  - Média mensal: R$ {r['media_pos_financ']:,.2f}")
 
         # Análise de payback mais realista
         print("\n=== ANÁLISE DE PAYBACK ===")
 
         # Identifica quando o fluxo acumulado fica definitivamente positivo
-        acum_min = df["Acumulado (R$)"].min()
-        mes_min = df["Acumulado (R$)"].idxmin() + 1
-
-        print(f"Acumulado mínimo: R$ {acum_min:,.2f} no mês {mes_min}")
+        print(f"Acumulado mínimo: R$ {r['acum_min']:,.2f} no mês {r['idx_min'] + 1}")
 
         # Verifica se há payback (acumulado positivo ao final)
         if fluxo_final > 0:
             # Encontra quando cruza zero pela última vez
-            df_negativo = df[df["Acumulado (R$)"] < 0]
-            if not df_negativo.empty:
-                ultimo_mes_negativo = df_negativo.iloc[-1]["Mês"]
+            ultimo_mes_negativo = r["ultimo_mes_negativo"]
+            if ultimo_mes_negativo is not None:
                 mes_payback = ultimo_mes_negativo + 1
                 ano_payback = mes_payback // 12
                 mes_resto = mes_payback % 12
@@ -257,7 +486,14 @@ def exibir_resultados(df, meses_financiamento, exportar_csv=True, nome_arquivo="
 
     # Exportar para CSV
     if exportar_csv:
-        df.to_csv(nome_arquivo, index=False, encoding='utf-8-sig')
+        # Polars (se disponível) só escreve o CSV; a tabela exibida é sempre a do pandas
+        pl = _importar_polars()
+        if pl is not None:
+            tabela_pl = pl.DataFrame(dados) if isinstance(dados, dict) else pl.from_pandas(dados)
+            tabela_pl.write_csv(nome_arquivo, include_bom=True)
+        else:
+            tabela = para_dataframe(dados) if isinstance(dados, dict) else dados
+            tabela.to_csv(nome_arquivo, index=False, encoding='utf-8-sig')
         print(f"\n=== ARQUIVO EXPORTADO ===")
         print(f"Dados salvos em: {nome_arquivo}")
 
@@ -282,8 +518,12 @@ def main():
                         help="Percentual de autoconsumo instantâneo (0-1)")
 
     # Parâmetros financeiros
-    parser.add_argument("--parcela", type=float, default=750,
-                        help="Valor da parcela do financiamento (R$/mês)")
+    parser.add_argument("--valor-sistema", type=float, default=28000,
+                        help="Valor total do sistema solar (R$)")
+    parser.add_argument("--entrada", type=float, default=0,
+                        help="Valor da entrada paga no início (R$)")
+    parser.add_argument("--taxa-juros-anual", type=float, default=0.10,
+                        help="Taxa de juros anual do financiamento (0-1)")
     parser.add_argument("--meses-financiamento", type=int, default=72,
                         help="Duração do financiamento em meses")
     parser.add_argument("--manutencao-anual", type=float, default=750,
@@ -306,17 +546,22 @@ def main():
                         help="Nome do arquivo CSV de saída")
     parser.add_argument("--no-export", action="store_true",
                         help="Não exportar para CSV")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Exibir apenas o resumo (sem tabela mensal nem CSV)")
 
     args = parser.parse_args()
+    preparar_simulacao()
 
     # Executar simulação
-    df = simular_solar(
+    dados = calcular_simulacao(
         tarifa_inicial=args.tarifa_inicial,
         fio_b_inicial=args.fio_b_inicial,
         geracao_mensal_media=args.geracao_mensal,
         consumo_mensal=args.consumo_mensal,
         perc_autoconsumo=args.autoconsumo,
-        valor_parcela=args.parcela,
+        valor_sistema=args.valor_sistema,
+        entrada=args.entrada,
+        taxa_juros_anual=args.taxa_juros_anual,
         meses_financiamento=args.meses_financiamento,
         anos_simulacao=args.anos,
         reajuste_anual=args.reajuste_anual,
@@ -328,10 +573,11 @@ def main():
 
     # Exibir resultados
     exibir_resultados(
-        df,
+        dados,
         meses_financiamento=args.meses_financiamento,
-        exportar_csv=not args.no_export,
-        nome_arquivo=args.output
+        exportar_csv=not (args.no_export or args.summary_only),
+        nome_arquivo=args.output,
+        exibir_tabela=not args.summary_only
     )
 
 